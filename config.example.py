@@ -15,8 +15,17 @@ SFTP_MODS_PATH = "/path/to/mods"            # Path to mods folder (e.g., "/mods"
 # USE_FTP = False  # Force SFTP mode
 # USE_FTP = None   # Auto-detect (default)
 
+# Parallel SFTP sessions used while scanning mods (Optional)
+# SFTP_POOL_SIZE = 4  # Default: half the CPU cores, at least 4
+
 # Discord Webhook
 DISCORD_WEBHOOK_URL = "https://discord.com/api/webhooks/YOUR_WEBHOOK_URL"
 
+# Discord Notification Options (Optional)
+# DISCORD_BATCH_SIZE = 10              # Daemon mode: send once this many changes are queued
+# DISCORD_FLUSH_INTERVAL_SECONDS = 60  # ...or once this many seconds have passed
+# DISCORD_GZIP = False                 # Compress webhook payloads (opt-in)
+
 # Monitoring Settings (optional customization)
 STATE_FILE = "mod_state.json"              # File to store mod state between runs
+POLL_INTERVAL_SECONDS = 300                # Seconds between checks in daemon mode (--daemon)
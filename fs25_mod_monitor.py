@@ -4,15 +4,39 @@ Tracks mod changes (add/remove/update) via SFTP and posts to Discord
 """
 
 import paramiko
+import gzip
 import json
 import os
+import sys
+import time
 import zipfile
 import io
-import xml.etree.ElementTree as ET
+import queue
+import signal
+import socket
 from datetime import datetime
 from pathlib import Path
 import requests
-from ftplib import FTP, FTP_TLS
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from ftplib import FTP, FTP_TLS, all_errors, error_perm, error_temp
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+# Prefer lxml's C parser for modDesc.xml, fall back to the standard library
+try:
+    from lxml import etree as ET
+    # Mod files are untrusted, never expand entities or allow huge trees
+    XML_PARSER_OPTIONS = {'resolve_entities': False, 'huge_tree': False}
+except ImportError:
+    import xml.etree.ElementTree as ET
+    XML_PARSER_OPTIONS = {}
+
+# Prefer orjson for the state file, fall back to the standard library
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Import configuration
 try:
@@ -34,6 +58,62 @@ STATE_FILE = config.STATE_FILE
 # FTP/SFTP mode selection (will auto-detect)
 USE_FTP = getattr(config, 'USE_FTP', None)  # Can be True, False, or None (auto-detect)
 
+# Number of parallel SFTP sessions used to scan mods
+SFTP_POOL_SIZE = getattr(config, 'SFTP_POOL_SIZE', max(4, (os.cpu_count() or 1) // 2))
+
+# modDesc.xml is parsed in chunks of this size, the fields we need are near the top
+XML_READ_CHUNK_SIZE = 4096
+
+# Seconds between SSH keepalive packets, keeps idle connections open
+SSH_KEEPALIVE_SECONDS = 30
+
+# SSH keys tried before falling back to password authentication
+SSH_MAX_KEY_ATTEMPTS = 3
+
+# Read-ahead buffer for remote zip files (bytes)
+SFTP_READ_BUFFER_SIZE = 64 * 1024
+
+# Largest possible zip trailer: end of central directory record (22 bytes)
+# plus a maximum length archive comment
+ZIP_TAIL_SIZE = 22 + 65535
+
+# Size of a zip local file header before its filename and extra field
+ZIP_LOCAL_HEADER_SIZE = 30
+
+# Seconds between checks when running with --daemon
+POLL_INTERVAL_SECONDS = getattr(config, 'POLL_INTERVAL_SECONDS', 300)
+
+# Daemon mode batches changes into one Discord message, sent once this many
+# changes are queued or this many seconds have passed since the last message
+DISCORD_BATCH_SIZE = getattr(config, 'DISCORD_BATCH_SIZE', 10)
+DISCORD_FLUSH_INTERVAL_SECONDS = getattr(config, 'DISCORD_FLUSH_INTERVAL_SECONDS', 60)
+
+# Compress webhook payloads (large change batches shrink 5-10x)
+# Off by default, enable only after confirming your webhook accepts it
+DISCORD_GZIP = getattr(config, 'DISCORD_GZIP', False)
+
+# Reused HTTP session so repeated notifications share one connection to Discord
+# Ratelimits and transient server errors are retried with backoff
+discord_session = requests.Session()
+discord_session.headers['User-Agent'] = 'fs25-mod-monitor'
+discord_session.mount('https://', HTTPAdapter(
+    pool_connections=1,
+    pool_maxsize=4,
+    max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 502, 503],
+                      allowed_methods=['POST'])
+))
+
+class HostKeyMismatchError(Exception):
+    """
+    The SFTP server's key doesn't match known_hosts (possible man-in-the-middle)
+    Deliberately not an SSHException, so nothing retries or falls back to FTP
+    """
+
+# Errors that mean the FTP/SFTP connection itself failed (not a bad mod file).
+# Plain OSError and ftplib's permanent errors are left out, a missing or
+# unreadable mods directory is a config problem and reconnecting won't fix it
+CONNECTION_ERRORS = (paramiko.SSHException, EOFError, ConnectionError, socket.timeout, error_temp)
+
 # =========================
 # FUNCTIONS
 # =========================
@@ -60,27 +140,94 @@ def connect_ftp():
         print(f"✗ FTP Connection failed: {e}")
         return None, None
 
+def load_ssh_keys(agent):
+    """
+    Collect SSH keys to try, in order: ssh-agent keys, then ~/.ssh/id_ed25519
+    and ~/.ssh/id_rsa (unencrypted key files only)
+    """
+    keys = list(agent.get_keys())
+    
+    for key_class, filename in ((paramiko.Ed25519Key, 'id_ed25519'),
+                                (paramiko.RSAKey, 'id_rsa')):
+        key_path = os.path.expanduser(f'~/.ssh/{filename}')
+        if os.path.exists(key_path):
+            try:
+                keys.append(key_class.from_private_key_file(key_path))
+            except paramiko.SSHException:
+                # Passphrase protected or unreadable, load it into ssh-agent instead
+                pass
+    
+    return keys
+
+def load_known_host_keys():
+    """
+    Look up the server in ~/.ssh/known_hosts
+    Returns: dict of key type -> key, empty if the server isn't listed
+    """
+    known_hosts = paramiko.HostKeys()
+    try:
+        known_hosts.load(os.path.expanduser('~/.ssh/known_hosts'))
+    except (IOError, paramiko.SSHException):
+        return {}
+    
+    host = SFTP_HOST if SFTP_PORT == 22 else f"[{SFTP_HOST}]:{SFTP_PORT}"
+    return known_hosts.lookup(host) or {}
+
 def connect_sftp():
     """Establish SFTP connection to the server"""
     try:
         transport = paramiko.Transport((SFTP_HOST, SFTP_PORT))
         
-        # Try SSH key authentication first (more secure)
+        # When the server is in known_hosts, only negotiate the key types
+        # listed there so it can't dodge the check with another key type
+        known_keys = load_known_host_keys()
+        if known_keys:
+            key_types = []
+            for key_type in known_keys:
+                if key_type == 'ssh-rsa':
+                    # RSA keys are negotiated with SHA-2 signatures first
+                    key_types += ['rsa-sha2-512', 'rsa-sha2-256']
+                key_types.append(key_type)
+            transport.get_security_options().key_types = key_types
+        
+        transport.start_client()
+        
+        # Verify the server against known_hosts when it is listed there
+        server_key = transport.get_remote_server_key()
+        if known_keys and not any(key == server_key for key in known_keys.values()):
+            transport.close()
+            raise HostKeyMismatchError(f"Host key for {SFTP_HOST} does not match known_hosts")
+        
+        # Keep the SSH session from timing out between checks
+        transport.set_keepalive(SSH_KEEPALIVE_SECONDS)
+        
+        # Try SSH key authentication first (more secure and faster)
+        agent = paramiko.Agent()
         try:
-            key_path = os.path.expanduser('~/.ssh/id_rsa')
-            if os.path.exists(key_path):
-                private_key = paramiko.RSAKey.from_private_key_file(key_path)
-                transport.connect(username=SFTP_USERNAME, pkey=private_key)
-                print(f"✓ Connected to {SFTP_HOST} (using SSH key)")
-            else:
-                transport.connect(username=SFTP_USERNAME, password=SFTP_PASSWORD)
-                print(f"✓ Connected to {SFTP_HOST} (using password)")
-        except paramiko.ssh_exception.AuthenticationException:
-            transport.connect(username=SFTP_USERNAME, password=SFTP_PASSWORD)
+            # Capped so the password still gets a turn before MaxAuthTries
+            for key in load_ssh_keys(agent)[:SSH_MAX_KEY_ATTEMPTS]:
+                try:
+                    transport.auth_publickey(SFTP_USERNAME, key)
+                    print(f"✓ Connected to {SFTP_HOST} (using SSH key)")
+                    break
+                except paramiko.BadAuthenticationType as e:
+                    if 'publickey' not in e.allowed_types:
+                        # Password-only server, don't waste round trips on keys
+                        break
+                except paramiko.SSHException:
+                    continue
+        finally:
+            agent.close()
+        
+        if not transport.is_authenticated():
+            transport.auth_password(SFTP_USERNAME, SFTP_PASSWORD)
             print(f"✓ Connected to {SFTP_HOST} (using password)")
         
         sftp = paramiko.SFTPClient.from_transport(transport)
         return sftp, transport
+    except HostKeyMismatchError:
+        # Never fall back to FTP (sending the password) after a failed host check
+        raise
     except Exception as e:
         print(f"✗ SFTP Connection failed: {e}")
         return None, None
@@ -118,6 +265,157 @@ def connect_server():
         client, transport = connect_sftp()
         return (client, 'sftp') if client else (None, None)
 
+class SFTPConnectionPool:
+    """
+    Pool of SFTP sessions opened over the SSH transport of an existing client
+    The existing client is always part of the pool, so it never comes up empty
+    """
+
+    def __init__(self, client, size):
+        self._clients = queue.Queue()
+        self._extra_clients = []
+        self._clients.put(client)
+        
+        transport = client.get_channel().get_transport()
+        for _ in range(size - 1):
+            try:
+                sftp = paramiko.SFTPClient.from_transport(transport)
+            except paramiko.SSHException:
+                # Server caps the number of sessions, use what we have
+                break
+            self._extra_clients.append(sftp)
+            self._clients.put(sftp)
+    
+    @property
+    def size(self):
+        return len(self._extra_clients) + 1
+    
+    @contextmanager
+    def connection(self):
+        """Check out a client for the duration of the with block"""
+        client = self._clients.get()
+        try:
+            yield client
+        finally:
+            self._clients.put(client)
+    
+    def close(self):
+        """Close the extra sessions (the original client is left open)"""
+        for sftp in self._extra_clients:
+            sftp.close()
+        self._extra_clients = []
+
+class RemoteZipFile:
+    """
+    Seekable read-only view of a remote SFTP file for zipfile
+    Byte ranges fetched up front with fetch_ranges() are served from memory,
+    any other read falls back to the remote file
+    """
+
+    def __init__(self, remote_file, size):
+        self._remote_file = remote_file
+        self._size = size
+        self._pos = 0
+        self._ranges = []  # (offset, data)
+    
+    def fetch_ranges(self, ranges):
+        """Fetch several (offset, length) ranges in a single pipelined readv"""
+        ranges = [(offset, min(length, self._size - offset))
+                  for offset, length in ranges if offset < self._size]
+        for (offset, _), data in zip(ranges, self._remote_file.readv(ranges)):
+            self._ranges.append((offset, data))
+    
+    def seekable(self):
+        return True
+    
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self._pos
+        elif whence == io.SEEK_END:
+            offset += self._size
+        self._pos = offset
+        return self._pos
+    
+    def tell(self):
+        return self._pos
+    
+    def read(self, n=-1):
+        if n < 0 or self._pos + n > self._size:
+            n = max(self._size - self._pos, 0)
+        
+        end = self._pos + n
+        for offset, data in self._ranges:
+            if offset <= self._pos and end <= offset + len(data):
+                chunk = data[self._pos - offset:end - offset]
+                break
+        else:
+            self._remote_file.seek(self._pos)
+            chunk = self._remote_file.read(n)
+        
+        self._pos += len(chunk)
+        return chunk
+    
+    def close(self):
+        self._remote_file.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+
+def iter_xml_events(xml_file):
+    """
+    Yield (event, element) start/end events, reading the file a chunk at a time
+    Reading (and decompressing, for zip members) stops as soon as the caller
+    stops iterating
+    """
+    parser = ET.XMLPullParser(events=('start', 'end'), **XML_PARSER_OPTIONS)
+    
+    while True:
+        chunk = xml_file.read(XML_READ_CHUNK_SIZE)
+        if not chunk:
+            break
+        parser.feed(chunk)
+        yield from parser.read_events()
+    
+    parser.close()
+    yield from parser.read_events()
+
+def parse_mod_desc(xml_file):
+    """
+    Stream modDesc.xml and collect the fields the monitor needs
+    Stops parsing as soon as title/en, version and author have been found
+    Returns: dict with any of title, any_title (first <title> text), version, author
+    """
+    fields = {}
+    path = []
+    
+    for event, elem in iter_xml_events(xml_file):
+        if event == 'start':
+            path.append(elem.tag)
+            continue
+        
+        path.pop()
+        tag = elem.tag
+        
+        if tag == 'en' and path and path[-1] == 'title':
+            fields.setdefault('title', elem.text)
+        elif tag == 'title':
+            fields.setdefault('any_title', elem.text)
+        elif tag == 'version' and len(path) == 1:
+            # Only <version> directly under <modDesc>, not nested elements
+            fields.setdefault('version', elem.text)
+        elif tag == 'author':
+            fields.setdefault('author', elem.text)
+        
+        elem.clear()
+        
+        if 'title' in fields and 'version' in fields and 'author' in fields:
+            break
+    
+    return fields
+
 def extract_mod_info(client, conn_type, remote_file_path, file_size):
     """
     Extract mod information from modDesc.xml inside the zip file
@@ -125,143 +423,219 @@ def extract_mod_info(client, conn_type, remote_file_path, file_size):
     Returns: dict with title, version, author, filesize
     """
     try:
-        # Download the zip file to memory
-        zip_data = io.BytesIO()
-        
         if conn_type == 'sftp':
-            with client.file(remote_file_path, 'r') as remote_file:
-                zip_data.write(remote_file.read())
+            # SFTP files are seekable, so zipfile only reads the central
+            # directory at the tail and the modDesc.xml member itself.
+            # The tail (which usually holds the whole central directory) is
+            # fetched in one request; the large read buffer keeps any other
+            # reads down to a few SFTP round trips
+            remote_file = client.file(remote_file_path, 'rb', bufsize=SFTP_READ_BUFFER_SIZE)
+            zip_data = RemoteZipFile(remote_file, file_size)
         else:  # FTP
+            # FTP has no random access, download the zip file to memory
+            zip_data = io.BytesIO()
             client.retrbinary(f'RETR {remote_file_path}', zip_data.write)
+            zip_data.seek(0)
         
-        zip_data.seek(0)
-                
-        # Open zip and extract modDesc.xml
-        with zipfile.ZipFile(zip_data, 'r') as zip_ref:
-            # Try to find modDesc.xml (case-insensitive)
-            mod_desc_name = None
-            for name in zip_ref.namelist():
-                if name.lower().endswith('moddesc.xml'):
-                    mod_desc_name = name
-                    break
-            
-            if not mod_desc_name:
-                return {
-                    'title': Path(remote_file_path).stem,
-                    'version': 'Unknown',
-                    'author': 'Unknown',
-                    'filesize': file_size
-                }
-            
-            # Parse the XML
-            with zip_ref.open(mod_desc_name) as xml_file:
-                tree = ET.parse(xml_file)
-                root = tree.getroot()
-                
-                # Extract mod information
-                title = root.find('.//title/en')
-                if title is None:
-                    title = root.find('.//title')
-                title = title.text if title is not None else Path(remote_file_path).stem
+        # Open zip and extract modDesc.xml (the remote file is closed even
+        # if a fetch fails)
+        with zip_data:
+            if isinstance(zip_data, RemoteZipFile):
+                zip_data.fetch_ranges([(max(file_size - ZIP_TAIL_SIZE, 0), ZIP_TAIL_SIZE)])
+            with zipfile.ZipFile(zip_data, 'r') as zip_ref:
+                # modDesc.xml is normally at the archive root, otherwise search
+                # for it (case-insensitive)
+                try:
+                    mod_desc_info = zip_ref.getinfo('modDesc.xml')
+                except KeyError:
+                    mod_desc_info = next((info for info in zip_ref.infolist()
+                                          if info.filename.lower().endswith('moddesc.xml')), None)
                 
-                version_elem = root.find('version')
-                version = version_elem.text if version_elem is not None else 'Unknown'
+                if mod_desc_info is None:
+                    return {
+                        'title': Path(remote_file_path).stem,
+                        'version': 'Unknown',
+                        'author': 'Unknown',
+                        'filesize': file_size
+                    }
                 
-                author = root.find('.//author')
-                author = author.text if author is not None else 'Unknown'
+                if isinstance(zip_data, RemoteZipFile):
+                    # Fetch the local header and compressed modDesc.xml in one request
+                    zip_data.fetch_ranges([(
+                        mod_desc_info.header_offset,
+                        ZIP_LOCAL_HEADER_SIZE + len(mod_desc_info.orig_filename.encode('utf-8'))
+                        + len(mod_desc_info.extra) + mod_desc_info.compress_size
+                    )])
                 
-                return {
-                    'title': title,
-                    'version': version,
-                    'author': author,
-                    'filesize': file_size
-                }
+                # Parse the XML
+                with zip_ref.open(mod_desc_info) as xml_file:
+                    fields = parse_mod_desc(xml_file)
+                    
+                    # Extract mod information
+                    if 'title' in fields:
+                        title = fields['title']
+                    else:
+                        title = fields.get('any_title', Path(remote_file_path).stem)
+                    
+                    return {
+                        'title': title,
+                        'version': fields.get('version', 'Unknown'),
+                        'author': fields.get('author', 'Unknown'),
+                        'filesize': file_size
+                    }
     
+    except CONNECTION_ERRORS:
+        # A dropped connection is not a broken mod, let run_once skip the check
+        raise
     except Exception as e:
+        # Closed SFTP channels can also surface as plain OSError
+        if conn_type == 'sftp' and not connection_alive(client, conn_type):
+            raise paramiko.SSHException(f"Connection lost while reading {remote_file_path}") from e
         print(f"  Warning: Could not parse {remote_file_path}: {e}")
+        # Marked so the next run scans this mod again instead of reusing it
         return {
             'title': Path(remote_file_path).stem,
             'version': 'Unknown',
             'author': 'Unknown',
-            'filesize': file_size
+            'filesize': file_size,
+            'parsed': False
         }
 
-def get_current_mods(client, conn_type):
+def get_cached_mod_info(previous_mods, filename, file_size):
+    """
+    Return the previously parsed info for a mod if its size is unchanged,
+    otherwise None (the mod needs to be scanned)
+    File size is the only update signal detect_changes can see without
+    downloading the mod, so a touched but identical zip is not re-parsed.
+    Entries from a failed parse are never reused
+    """
+    cached = previous_mods.get(filename)
+    if cached and cached['filesize'] == file_size and cached.get('parsed', True):
+        return cached
+    return None
+
+def list_ftp_mods(client):
+    """
+    List .zip files in the mods directory using MLSD (machine-readable listing)
+    Returns: list of (filename, file_size)
+    Raises error_perm if the server doesn't support MLSD
+    """
+    zip_files = []
+    
+    for filename, facts in client.mlsd(SFTP_MODS_PATH, facts=['type', 'size']):
+        if facts.get('type') != 'file' or not filename.lower().endswith('.zip'):
+            continue
+        zip_files.append((filename, int(facts.get('size', 0))))
+    
+    return zip_files
+
+def list_ftp_mods_legacy(client):
+    """
+    List .zip files in the mods directory by parsing LIST output
+    Only used for servers without MLSD support
+    Returns: list of (filename, file_size)
+    """
+    # Change to mods directory
+    client.cwd(SFTP_MODS_PATH)
+    
+    # Get file listing with detailed info
+    file_list = []
+    client.dir(file_list.append)
+    
+    zip_files = []
+    
+    # Parse each file in the listing
+    for file_line in file_list:
+        # Parse FTP LIST output
+        # Typical format: -rw-r--r-- 1 owner group size month day time filename
+        # or: drwxr-xr-x 2 owner group size month day time foldername
+        parts = file_line.split()
+        
+        if len(parts) < 9:
+            continue
+        
+        # Skip directories (first char is 'd')
+        if parts[0].startswith('d'):
+            continue
+        
+        filename = parts[-1]
+        
+        # Only process .zip files
+        if not filename.lower().endswith('.zip'):
+            continue
+        
+        # File size is the 5th column (the 2nd is the link count, not the size)
+        try:
+            file_size = int(parts[4])
+        except ValueError:
+            print(f"  Warning: Could not determine size for {filename}, using 0")
+            file_size = 0
+        
+        zip_files.append((filename, file_size))
+    
+    return zip_files
+
+def get_current_mods(client, conn_type, previous_mods=None):
     """
     Scan the mods directory and return a dict of current mods with their info
     Works with both FTP and SFTP
+    Mods whose size matches previous_mods are not re-parsed
     Key: filename, Value: {title, version, author, filesize}
+    Returns None if the directory could not be scanned; connection errors
+    are raised
     """
     current_mods = {}
+    previous_mods = previous_mods or {}
 
     try:
         if conn_type == 'sftp':
             # SFTP method
             files = client.listdir_attr(SFTP_MODS_PATH)
             
-            for file_attr in files:
-                filename = file_attr.filename
-                
-                # Only process .zip files
-                if not filename.lower().endswith('.zip'):
-                    continue
-                
-                file_size = file_attr.st_size
-                remote_path = f"{SFTP_MODS_PATH}/{filename}"
-                
-                print(f"  Scanning: {filename}")
-                mod_info = extract_mod_info(client, conn_type, remote_path, file_size)
-                current_mods[filename] = mod_info
-
-        else:  # FTP
-            # Change to mods directory
-            client.cwd(SFTP_MODS_PATH)
-
-            # Get file listing with detailed info
-            file_list = []
-
-            def parse_line(line):
-                """Callback to collect directory listing lines"""
-                file_list.append(line)
+            # Only process .zip files
+            zip_files = [f for f in files if f.filename.lower().endswith('.zip')]
             
-            client.dir(parse_line)       
+            # Reuse cached info for unchanged mods, only scan the rest
+            to_scan = []
+            for file_attr in zip_files:
+                cached = get_cached_mod_info(previous_mods, file_attr.filename,
+                                             file_attr.st_size)
+                if cached:
+                    current_mods[file_attr.filename] = cached
+                else:
+                    to_scan.append(file_attr)
             
-            # Parse each file in the listing
-            for file_line in file_list:
-                # Parse FTP LIST output 
-                 # Typical format: -rw-r--r-- 1 owner group size month day time filename
-                # or: drwxr-xr-x 2 owner group size month day time foldername
-                parts = file_line.split()
-
-                if len(parts) < 9:
-                    continue
-
-                # Skip directories (first char is 'd')
-                if parts[0].startswith('d'):
-                    continue               
+            def scan(file_attr):
+                """Extract one mod's info using a pooled SFTP session"""
+                remote_path = f"{SFTP_MODS_PATH}/{file_attr.filename}"
+                print(f"  Scanning: {file_attr.filename}")
+                with pool.connection() as sftp:
+                    return extract_mod_info(sftp, conn_type, remote_path, file_attr.st_size)
+            
+            # Only open extra SFTP sessions when there is something to scan
+            if to_scan:
+                pool = SFTPConnectionPool(client, SFTP_POOL_SIZE)
+                try:
+                    with ThreadPoolExecutor(max_workers=pool.size) as executor:
+                        results = executor.map(scan, to_scan)
+                        for file_attr, mod_info in zip(to_scan, results):
+                            current_mods[file_attr.filename] = mod_info
+                finally:
+                    pool.close()
 
-                filename = parts[-1]
-                
-                # Only process .zip files
-                if not filename.lower().endswith('.zip'):
+        else:  # FTP
+            try:
+                zip_files = list_ftp_mods(client)
+            except error_perm:
+                # Server doesn't support MLSD
+                zip_files = list_ftp_mods_legacy(client)
+            
+            for filename, file_size in zip_files:
+                cached = get_cached_mod_info(previous_mods, filename, file_size)
+                if cached:
+                    current_mods[filename] = cached
                     continue
                 
-                # Get file size (varies by FTP server format, usually 5th column)
-                try:
-                    # Try to find the size - it's usually the first number-only field
-                    file_size = None
-                    for part in parts[1:8]:  # Size is typically in first 8 columns
-                        if part.isdigit():
-                            file_size = int(part)
-                            break
-
-                    if file_size is None:
-                        # Fallback: assume 5th position (index 4)
-                        file_size = int(parts[4])                   
-                except (ValueError, IndexError):
-                    print(f"  Warning: Could not determine size for {filename}, using 0")
-                    file_size = 0
-
                 remote_path = f"{SFTP_MODS_PATH}/{filename}"
                 
                 print(f"  Scanning: {filename}")
@@ -271,32 +645,65 @@ def get_current_mods(client, conn_type):
         print(f"✓ Found {len(current_mods)} mods")
         return current_mods
     
+    except CONNECTION_ERRORS:
+        # A dead connection is not an empty server, let the caller reconnect
+        raise
     except Exception as e:
         print(f"✗ Error scanning mods directory: {e}")
-        return {}
+        return None
+
+# Last loaded/saved state, reused while the state file is unchanged (daemon mode)
+_state_cache = {'mtime': None, 'data': None}
 
 def load_previous_state():
     """Load the previous state from JSON file"""
-    if os.path.exists(STATE_FILE):
-        try:
-            with open(STATE_FILE, 'r') as f:
-                return json.load(f)
-        except:
-            return {}
-    return {}
+    try:
+        mtime = os.stat(STATE_FILE).st_mtime_ns
+    except OSError:
+        return {}
+    
+    if mtime == _state_cache['mtime']:
+        return _state_cache['data']
+    
+    try:
+        if orjson:
+            with open(STATE_FILE, 'rb') as f:
+                data = orjson.loads(f.read())
+        else:
+            with open(STATE_FILE, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+    except:
+        return {}
+    
+    _state_cache['mtime'] = mtime
+    _state_cache['data'] = data
+    return data
 
 def save_current_state(mods):
-    """Save current state to JSON file"""
-    with open(STATE_FILE, 'w') as f:
-        json.dump(mods, f, indent=2)
+    """
+    Save current state to JSON file
+    Writes to a temporary file first so the state file is replaced atomically
+    """
+    temp_file = STATE_FILE + '.tmp'
+    if orjson:
+        with open(temp_file, 'wb') as f:
+            f.write(orjson.dumps(mods, option=orjson.OPT_INDENT_2))
+    else:
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump(mods, f, indent=2)
+    os.replace(temp_file, STATE_FILE)
+    
+    # The next load can reuse what was just written instead of parsing it
+    _state_cache['mtime'] = os.stat(STATE_FILE).st_mtime_ns
+    _state_cache['data'] = mods
+
+FILE_SIZE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB')
 
 def format_file_size(size_bytes):
     """Convert bytes to human readable format"""
-    for unit in ['B', 'KB', 'MB', 'GB']:
-        if size_bytes < 1024.0:
-            return f"{size_bytes:.2f} {unit}"
-        size_bytes /= 1024.0
-    return f"{size_bytes:.2f} TB"
+    # Each unit is 2**10 times the previous one, so the bit length picks it
+    unit_index = min((max(size_bytes, 1).bit_length() - 1) // 10, len(FILE_SIZE_UNITS) - 1)
+    return f"{size_bytes / (1 << (unit_index * 10)):.2f} {FILE_SIZE_UNITS[unit_index]}"
 
 def detect_changes(previous_mods, current_mods):
     """
@@ -305,35 +712,61 @@ def detect_changes(previous_mods, current_mods):
     """
     changes = []
     
-    # Detect additions
     for filename, info in current_mods.items():
-        if filename not in previous_mods:
+        previous = previous_mods.get(filename)
+        
+        # Detect additions
+        if previous is None:
             changes.append({
                 'type': 'added',
                 'filename': filename,
                 'info': info
             })
         # Detect updates (version or filesize changed)
-        elif (info['version'] != previous_mods[filename]['version'] or 
-              info['filesize'] != previous_mods[filename]['filesize']):
+        elif (info['version'], info['filesize']) != (previous['version'], previous['filesize']):
             changes.append({
                 'type': 'updated',
                 'filename': filename,
                 'info': info,
-                'old_version': previous_mods[filename]['version']
+                'old_version': previous['version']
             })
     
-    # Detect removals
-    for filename in previous_mods:
-        if filename not in current_mods:
+    # Detect removals (keep the previous state's order for the notification)
+    removed = previous_mods.keys() - current_mods.keys()
+    for filename, info in previous_mods.items():
+        if filename in removed:
             changes.append({
                 'type': 'removed',
                 'filename': filename,
-                'info': previous_mods[filename]
+                'info': info
             })
     
     return changes
 
+def post_to_discord(payload):
+    """
+    POST a payload to the Discord webhook, gzip-compressed when enabled
+    Falls back to (and sticks with) plain JSON if Discord answers 415
+    (Unsupported Media Type); other errors are returned as-is
+    """
+    global DISCORD_GZIP
+    
+    body = json.dumps(payload).encode('utf-8')
+    headers = {'Content-Type': 'application/json'}
+    
+    if DISCORD_GZIP:
+        response = discord_session.post(
+            DISCORD_WEBHOOK_URL,
+            data=gzip.compress(body),
+            headers={**headers, 'Content-Encoding': 'gzip'},
+            timeout=10
+        )
+        if response.status_code != 415:
+            return response
+        DISCORD_GZIP = False
+    
+    return discord_session.post(DISCORD_WEBHOOK_URL, data=body, headers=headers, timeout=10)
+
 def send_discord_notification(changes, current_mods):
     """Send changes to Discord via webhook"""
     if not changes:
@@ -402,7 +835,7 @@ def send_discord_notification(changes, current_mods):
     }
     
     try:
-        response = requests.post(DISCORD_WEBHOOK_URL, json=payload)
+        response = post_to_discord(payload)
         if response.status_code == 204:
             print(f"✓ Discord notification sent ({len(changes)} changes)")
         else:
@@ -410,12 +843,110 @@ def send_discord_notification(changes, current_mods):
     except Exception as e:
         print(f"✗ Discord notification error: {e}")
 
-def main():
-    """Main monitoring function"""
+class ChangeQueue:
+    """
+    Collects changes across daemon checks and sends them as one notification
+    Flushes once DISCORD_BATCH_SIZE changes are queued or
+    DISCORD_FLUSH_INTERVAL_SECONDS have passed since the last flush
+    """
+
+    def __init__(self, batch_size=DISCORD_BATCH_SIZE, flush_interval=DISCORD_FLUSH_INTERVAL_SECONDS):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.changes = []
+        self.current_mods = {}
+        # Never flushed, so changes from the first check go out right away
+        self.last_flush = 0
+    
+    def add(self, changes, current_mods):
+        """Queue changes along with the server state they were detected in"""
+        self.changes.extend(changes)
+        self.current_mods = current_mods
+    
+    def flush_if_due(self):
+        """Send queued changes if the batch is full or the interval has passed"""
+        if (len(self.changes) >= self.batch_size or
+                time.time() - self.last_flush >= self.flush_interval):
+            self.flush()
+    
+    def flush(self):
+        """Send all queued changes now"""
+        if self.changes:
+            send_discord_notification(self.changes, self.current_mods)
+        self.changes = []
+        self.last_flush = time.time()
+
+def print_banner(title, show_time=False):
+    """Print a section banner"""
     print("\n" + "="*50)
-    print("FS25 Mod Monitor - Starting Check")
-    print(f"Time: {datetime.now().strftime('%Y-%m-%d %I:%M:%S %p')}")
+    print(title)
+    if show_time:
+        print(f"Time: {datetime.now().strftime('%Y-%m-%d %I:%M:%S %p')}")
     print("="*50 + "\n")
+
+def close_connection(client, conn_type):
+    """Close an FTP or SFTP connection"""
+    try:
+        if conn_type == 'sftp':
+            client.close()
+            # Note: transport is not returned in new structure, 
+            # but SFTP client close should handle cleanup
+        else:  # FTP
+            client.quit()
+    except Exception:
+        # Connection may already be dead, nothing left to clean up
+        pass
+    print("\n✓ Connection closed")
+
+def connection_alive(client, conn_type):
+    """Check whether an open FTP or SFTP connection is still usable"""
+    if conn_type == 'sftp':
+        transport = client.get_channel().get_transport()
+        return transport is not None and transport.is_active()
+    
+    try:
+        client.voidcmd('NOOP')
+        return True
+    except all_errors:
+        return False
+
+def run_once(client, conn_type, change_queue=None):
+    """
+    Run a single check against an already open connection
+    Changes are sent to Discord right away unless a ChangeQueue is given
+    """
+    # Load previous state
+    previous_mods = load_previous_state()
+    
+    # Get current mods (unchanged mods are taken from the previous state)
+    current_mods = get_current_mods(client, conn_type, previous_mods)
+    if current_mods is None:
+        print("\n✗ Scan failed, skipping change detection (state left unchanged)")
+        return
+    
+    # Detect changes
+    changes = detect_changes(previous_mods, current_mods)
+    
+    if changes:
+        print(f"\n✓ Detected {len(changes)} change(s)")
+        for change in changes:
+            print(f"  - {change['type'].upper()}: {change['filename']}")
+        
+        # Send Discord notification
+        if change_queue is not None:
+            change_queue.add(changes, current_mods)
+        else:
+            send_discord_notification(changes, current_mods)
+    else:
+        print("\n✓ No changes detected")
+    
+    # Save current state (skipped when nothing changed)
+    if current_mods != previous_mods or not os.path.exists(STATE_FILE):
+        save_current_state(current_mods)
+
+def main():
+    """Main monitoring function"""
+    print_banner("FS25 Mod Monitor - Starting Check", show_time=True)
     
     # Connect to server (auto-detects FTP or SFTP)
     client, conn_type = connect_server()
@@ -423,41 +954,69 @@ def main():
         return
     
     try:
-        # Get current mods
-        current_mods = get_current_mods(client, conn_type)
-        
-        # Load previous state
-        previous_mods = load_previous_state()
-        
-        # Detect changes
-        changes = detect_changes(previous_mods, current_mods)
-        
-        if changes:
-            print(f"\n✓ Detected {len(changes)} change(s)")
-            for change in changes:
-                print(f"  - {change['type'].upper()}: {change['filename']}")
-            
-            # Send Discord notification
-            send_discord_notification(changes, current_mods)
-        else:
-            print("\n✓ No changes detected")
-        
-        # Save current state
-        save_current_state(current_mods)
-        
+        run_once(client, conn_type)
+    except CONNECTION_ERRORS as e:
+        print(f"\n✗ Connection error during check (state left unchanged): {e}")
     finally:
-        # Close connection
-        if conn_type == 'sftp':
-            client.close()
-            # Note: transport is not returned in new structure, 
-            # but SFTP client close should handle cleanup
-        else:  # FTP
-            client.quit()
-        print("\n✓ Connection closed")
+        close_connection(client, conn_type)
     
-    print("\n" + "="*50)
-    print("Check Complete")
-    print("="*50 + "\n")
+    print_banner("Check Complete")
+
+def run_daemon():
+    """
+    Keep one connection open and check for changes every POLL_INTERVAL_SECONDS
+    Reconnects automatically if the connection drops between checks
+    """
+    print_banner(f"FS25 Mod Monitor - Daemon Mode (every {POLL_INTERVAL_SECONDS}s)")
+    
+    client, conn_type = None, None
+    change_queue = ChangeQueue()
+    
+    # Turn SIGTERM (service stop, docker stop) into a normal exit so the
+    # finally block below still flushes queued changes
+    def handle_sigterm(signum, frame):
+        raise SystemExit(0)
+    signal.signal(signal.SIGTERM, handle_sigterm)
+    
+    try:
+        while True:
+            try:
+                if client and not connection_alive(client, conn_type):
+                    print("✗ Connection lost, reconnecting...")
+                    close_connection(client, conn_type)
+                    client, conn_type = None, None
+                
+                if not client:
+                    client, conn_type = connect_server()
+                
+                if client:
+                    print_banner("FS25 Mod Monitor - Starting Check", show_time=True)
+                    run_once(client, conn_type, change_queue)
+                    print_banner("Check Complete")
+            except CONNECTION_ERRORS as e:
+                print(f"✗ Connection error: {e}")
+                if client:
+                    close_connection(client, conn_type)
+                client, conn_type = None, None
+            
+            change_queue.flush_if_due()
+            time.sleep(POLL_INTERVAL_SECONDS)
+    except KeyboardInterrupt:
+        print("\n✓ Daemon stopped")
+    finally:
+        # Don't lose changes that were still waiting to be sent
+        change_queue.flush()
+        if client:
+            close_connection(client, conn_type)
 
 if __name__ == "__main__":
-    main()
+    try:
+        if '--daemon' in sys.argv[1:]:
+            run_daemon()
+        else:
+            main()
+    except HostKeyMismatchError as e:
+        print(f"✗ {e}")
+        print("  Refusing to connect. If the server key changed legitimately,")
+        print("  update ~/.ssh/known_hosts and run again.")
+        sys.exit(1)
@@ -9,8 +9,16 @@ import sys
 import os
 import subprocess
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+# Interpreter command for child scripts; -B skips writing .pyc files that
+# 'clean' would only delete again
+PYTHON = [sys.executable, "-B"]
+
+# File types removed by 'clean' (in addition to __pycache__ directories)
+CLEAN_FILE_SUFFIXES = (".pyc", ".pyo", ".log")
+
 def print_header(title):
     """Print a formatted header"""
     print("\n" + "=" * 50)
@@ -18,11 +26,11 @@ def print_header(title):
     print("=" * 50 + "\n")
 
 def run_command(cmd, description=None):
-    """Run a shell command"""
+    """Run a command given as an argument list (no shell)"""
     if description:
         print(f"🔄 {description}...")
     
-    result = subprocess.run(cmd, shell=True, capture_output=False)
+    result = subprocess.run(cmd, capture_output=False)
     return result.returncode == 0
 
 def show_help():
@@ -42,6 +50,7 @@ def show_help():
     print("Running:")
     print("  python run.py run           - Run the mod monitor once")
     print("  python run.py monitor       - Same as run")
+    print("  python run.py daemon        - Keep running, checking every poll interval")
     print("")
     print("Maintenance:")
     print("  python run.py update        - Pull latest from GitHub")
@@ -57,7 +66,7 @@ def install():
         print("✗ requirements.txt not found!")
         return False
     
-    success = run_command("pip install -r requirements.txt", "Installing packages")
+    success = run_command([*PYTHON, "-m", "pip", "install", "-r", "requirements.txt"], "Installing packages")
     
     if success:
         print("\n✅ Dependencies installed successfully!")
@@ -96,13 +105,36 @@ def setup():
     
     return True
 
+def run_command_captured(cmd):
+    """Run a command given as an argument list, returning (success, combined output)"""
+    # Piped output would use the locale codepage on Windows, which can't
+    # encode the emoji the test scripts print
+    result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                            encoding="utf-8", env={**os.environ, "PYTHONIOENCODING": "utf-8"})
+    return result.returncode == 0, result.stdout
+
 def test_all():
-    """Run all tests"""
+    """Run all tests (in parallel, output is shown per test once it finishes)"""
     print_header("Running All Tests")
     
-    test_ftp()
-    print("")
-    test_discord()
+    tests = [
+        ("Testing FTP/SFTP Connection", "test_connection.py"),
+        ("Testing Discord Webhook", "test_discord.py"),
+    ]
+    
+    with ThreadPoolExecutor(max_workers=len(tests)) as executor:
+        futures = {}
+        for _, script in tests:
+            if Path(script).exists():
+                futures[script] = executor.submit(run_command_captured, [*PYTHON, script])
+        
+        for title, script in tests:
+            print_header(title)
+            if script not in futures:
+                print(f"✗ {script} not found!")
+                continue
+            _, output = futures[script].result()
+            print(output, end="")
     
     print("\n✅ All tests complete!")
 
@@ -114,7 +146,7 @@ def test_ftp():
         print("✗ test_connection.py not found!")
         return False
     
-    return run_command("python test_connection.py")
+    return run_command([*PYTHON, "test_connection.py"])
 
 def test_discord():
     """Test Discord webhook"""
@@ -124,7 +156,7 @@ def test_discord():
         print("✗ test_discord.py not found!")
         return False
     
-    return run_command("python test_discord.py")
+    return run_command([*PYTHON, "test_discord.py"])
 
 def test_mod():
     """Test mod parser"""
@@ -141,7 +173,7 @@ def test_mod():
         return False
     
     mod_path = sys.argv[2]
-    return run_command(f"python test_mod_parser.py {mod_path}")
+    return run_command([*PYTHON, "test_mod_parser.py", mod_path])
 
 def run_monitor():
     """Run the mod monitor"""
@@ -151,13 +183,56 @@ def run_monitor():
         print("✗ fs25_mod_monitor.py not found!")
         return False
     
-    return run_command("python fs25_mod_monitor.py")
+    return run_command([*PYTHON, "fs25_mod_monitor.py"])
+
+def run_daemon():
+    """Run the mod monitor in daemon mode"""
+    print_header("Running FS25 Mod Monitor (Daemon Mode)")
+    
+    if not Path("fs25_mod_monitor.py").exists():
+        print("✗ fs25_mod_monitor.py not found!")
+        return False
+    
+    return run_command([*PYTHON, "fs25_mod_monitor.py", "--daemon"])
+
+def _dulwich_pull(porcelain):
+    """
+    Pull origin/main with dulwich, refusing the cases git pull would
+    dulwich resets the working tree to the fetched commit, so it must not
+    run over local changes or on a branch other than main
+    """
+    try:
+        branch = porcelain.active_branch(".")
+    except (KeyError, IndexError):
+        branch = None
+    if branch != b"main":
+        print("✗ Not on the main branch, switch to main before updating")
+        return False
+    
+    status = porcelain.status(".", untracked_files="no")
+    if any(status.staged.values()) or status.unstaged:
+        print("✗ You have local changes to tracked files, commit or stash them first")
+        return False
+    
+    porcelain.pull(".", "origin", [b"main"])
+    return True
 
 def update():
     """Update from GitHub"""
     print_header("Updating from GitHub")
     
-    success = run_command("git pull origin main", "Pulling latest changes")
+    try:
+        # Pull in-process when dulwich is installed, no git subprocesses
+        from dulwich import porcelain
+    except ImportError:
+        success = run_command(["git", "pull", "origin", "main"], "Pulling latest changes")
+    else:
+        print("🔄 Pulling latest changes...")
+        try:
+            success = _dulwich_pull(porcelain)
+        except Exception as e:
+            print(f"✗ {e}")
+            success = False
     
     if success:
         print("\n✅ Updated to latest version!")
@@ -167,32 +242,46 @@ def update():
     
     return success
 
+def _scandir_recursive(path):
+    """Yield every entry under path, depth first, without following symlinks"""
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                yield entry
+                if entry.is_dir(follow_symlinks=False):
+                    yield from _scandir_recursive(entry.path)
+    except FileNotFoundError:
+        # Directory was removed by the caller after it was yielded
+        return
+
+def _remove_pycache(path):
+    """Remove a __pycache__ directory, which only ever holds bytecode files"""
+    with os.scandir(path) as it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                # Unexpected layout, let shutil handle the whole tree
+                shutil.rmtree(path)
+                return
+            os.unlink(entry.path)
+    os.rmdir(path)
+
 def clean():
     """Clean cache and temporary files"""
     print_header("Cleaning Up")
     
-    patterns = [
-        ("__pycache__", "directory"),
-        ("*.pyc", "file"),
-        ("*.pyo", "file"),
-        ("*.log", "file"),
-    ]
-    
     cleaned = 0
     
-    for pattern, item_type in patterns:
-        if item_type == "directory":
-            for path in Path(".").rglob(pattern):
-                if path.is_dir():
-                    shutil.rmtree(path)
-                    cleaned += 1
-                    print(f"  Removed: {path}")
-        else:  # file
-            for path in Path(".").rglob(pattern):
-                if path.is_file():
-                    path.unlink()
-                    cleaned += 1
-                    print(f"  Removed: {path}")
+    # Single walk over the tree, matching every pattern per entry
+    for entry in _scandir_recursive("."):
+        if entry.is_dir(follow_symlinks=False):
+            if entry.name == "__pycache__":
+                _remove_pycache(entry.path)
+                cleaned += 1
+                print(f"  Removed: {Path(entry.path)}")
+        elif entry.is_file(follow_symlinks=False) and entry.name.endswith(CLEAN_FILE_SUFFIXES):
+            os.unlink(entry.path)
+            cleaned += 1
+            print(f"  Removed: {Path(entry.path)}")
     
     print(f"\n✅ Cleaned {cleaned} items!")
 
@@ -219,10 +308,14 @@ def status():
     if Path("mod_state.json").exists():
         print("✅ mod_state.json exists (monitoring active)")
         try:
-            import json
-            with open("mod_state.json") as f:
-                data = json.load(f)
-                print(f"   Tracking {len(data)} mods")
+            try:
+                import orjson
+                data = orjson.loads(Path("mod_state.json").read_bytes())
+            except ImportError:
+                import json
+                with open("mod_state.json", encoding="utf-8") as f:
+                    data = json.load(f)
+            print(f"   Tracking {len(data)} mods")
         except Exception as e:
             print(f"   ⚠️  Error reading state: {e}")
     else:
@@ -248,6 +341,7 @@ def main():
         "test-discord": test_discord,
         "run": run_monitor,
         "monitor": run_monitor,
+        "daemon": run_daemon,
         "update": update,
         "clean": clean,
         "status": status,
@@ -3,8 +3,11 @@ Quick FTP/SFTP Connection Test
 Tests your G-Portal credentials without running the full monitor
 """
 
-from ftplib import FTP, FTP_TLS
-import paramiko
+import re
+from ftplib import FTP, FTP_TLS, error_perm
+
+# Matches mod archives (case-insensitive) without lowercasing every name
+ZIP_RE = re.compile(r'\.zip\Z', re.IGNORECASE)
 
 # Import your config
 try:
@@ -42,26 +45,25 @@ try:
         print("✅ FTP connection successful!")
         conn_type = "FTP"
     
-    # Test directory access
+    # Test directory access (listing the directory proves access, so no CWD)
     print(f"\n🔄 Testing access to mods directory: {config.SFTP_MODS_PATH}")
-    ftp.cwd(config.SFTP_MODS_PATH)
+    try:
+        # MLSD gives machine-readable entries, so directories can be skipped
+        zip_files = [name for name, facts in ftp.mlsd(config.SFTP_MODS_PATH, facts=['type'])
+                     if facts.get('type') == 'file' and ZIP_RE.search(name)]
+    except error_perm:
+        # Server doesn't support MLSD, fall back to a names-only listing
+        ftp.cwd(config.SFTP_MODS_PATH)
+        zip_files = list(filter(ZIP_RE.search, ftp.nlst()))
     print("✅ Can access mods directory!")
     
     # List files
     print(f"\n📁 Files in {config.SFTP_MODS_PATH}:")
-    files = []
-    ftp.dir(files.append)
+    zip_count = len(zip_files)
     
-    zip_count = 0
-    for file_line in files:
-        if '.zip' in file_line.lower():
-            zip_count += 1
-            # Print first 5 zip files
-            if zip_count <= 5:
-                parts = file_line.split()
-                if len(parts) >= 9:
-                    filename = parts[-1]
-                    print(f"  - {filename}")
+    # Print first 5 zip files
+    for filename in zip_files[:5]:
+        print(f"  - {filename}")
     
     if zip_count > 5:
         print(f"  ... and {zip_count - 5} more .zip files")
@@ -87,6 +89,9 @@ if config.SFTP_PORT == 22:
     print("\n" + "=" * 50)
     print("\n🔄 Testing SFTP connection (port 22)...")
     try:
+        # Imported here so FTP-only setups don't pay paramiko's startup cost
+        import paramiko
+        
         transport = paramiko.Transport((config.SFTP_HOST, config.SFTP_PORT))
         transport.connect(username=config.SFTP_USERNAME, password=config.SFTP_PASSWORD)
         sftp = paramiko.SFTPClient.from_transport(transport)
@@ -98,7 +103,7 @@ if config.SFTP_PORT == 22:
         files = sftp.listdir(config.SFTP_MODS_PATH)
         print("✅ Can access mods directory!")
         
-        zip_files = [f for f in files if f.lower().endswith('.zip')]
+        zip_files = list(filter(ZIP_RE.search, files))
         print(f"\n✅ Found {len(zip_files)} mod files (.zip)")
         
         sftp.close()
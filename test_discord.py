@@ -19,6 +19,9 @@ print("=" * 50)
 print(f"\nWebhook URL: {config.DISCORD_WEBHOOK_URL[:50]}...")
 print("\n" + "=" * 50)
 
+# Both tests share one connection to Discord
+session = requests.Session()
+
 # Test 1: Simple text message
 print("\n🔄 Test 1: Sending simple text message...")
 try:
@@ -26,7 +29,7 @@ try:
         "content": "✅ Test message from FS25 Mod Monitor - webhook is working!"
     }
     
-    response = requests.post(config.DISCORD_WEBHOOK_URL, json=payload)
+    response = session.post(config.DISCORD_WEBHOOK_URL, json=payload, timeout=10)
     
     if response.status_code == 204:
         print("✅ Simple message sent successfully!")
@@ -57,7 +60,7 @@ try:
         }]
     }
     
-    response = requests.post(config.DISCORD_WEBHOOK_URL, json=payload)
+    response = session.post(config.DISCORD_WEBHOOK_URL, json=payload, timeout=10)
     
     if response.status_code == 204:
         print("✅ Embed sent successfully!")
@@ -2,13 +2,15 @@
 """
 Mod Parser Unit Test
 Tests modDesc.xml parsing and displays extracted data
-Usage: python test_mod_parser.py <path_to_mod.zip>
+Usage: python test_mod_parser.py [--json] <path_to_mod.zip>
 """
 
+import os
 import sys
 import zipfile
 import json
 import xml.etree.ElementTree as ET
+from itertools import islice
 from pathlib import Path
 
 def parse_mod(zip_path):
@@ -16,89 +18,123 @@ def parse_mod(zip_path):
     Parse a mod zip file and extract metadata
     Returns dict with mod information or None on error
     """
+    filename = Path(zip_path).name
+    
     try:
+        filesize = os.path.getsize(zip_path)
+        
         with zipfile.ZipFile(zip_path, 'r') as zip_ref:
             # Find modDesc.xml (case-insensitive)
-            mod_desc_name = None
-            for name in zip_ref.namelist():
-                if name.lower().endswith('moddesc.xml'):
-                    mod_desc_name = name
+            mod_desc_info = None
+            for info in zip_ref.infolist():
+                if info.filename.lower().endswith('moddesc.xml'):
+                    mod_desc_info = info
                     break
             
-            if not mod_desc_name:
+            if not mod_desc_info:
                 return {
                     'error': 'modDesc.xml not found in zip',
-                    'filename': Path(zip_path).name,
-                    'files_in_zip': zip_ref.namelist()[:10]  # First 10 files
+                    'filename': filename,
+                    'files_in_zip': [info.filename for info in islice(zip_ref.infolist(), 10)]  # First 10 files
                 }
             
-            # Parse the XML
-            with zip_ref.open(mod_desc_name) as xml_file:
-                tree = ET.parse(xml_file)
-                root = tree.getroot()
+            mod_desc_name = mod_desc_info.filename
+            
+            # Stream the XML in a single pass, keeping only what we need
+            with zip_ref.open(mod_desc_info) as xml_file:
+                found = {}
+                path = []
+                desc_version = None
+                store_items_count = 0
+                
+                for event, elem in ET.iterparse(xml_file, events=('start', 'end')):
+                    if event == 'start':
+                        if not path:
+                            desc_version = elem.get('descVersion', 'Not set')
+                        path.append(elem.tag)
+                        continue
+                    
+                    path.pop()
+                    tag = elem.tag
+                    depth = len(path)
+                    
+                    # Fields are direct children of <modDesc> (depth 1), with
+                    # translations one level below and store items under <storeItems>
+                    if depth == 2 and tag == 'en' and path[1] in ('title', 'description'):
+                        found.setdefault(f'{path[1]}_en', elem.text)
+                    elif depth == 1 and tag in ('title', 'description', 'author', 'version', 'iconFilename'):
+                        found.setdefault(tag, elem.text)
+                    elif depth == 1 and tag == 'multiplayer':
+                        found.setdefault(tag, elem.get('supported', 'unknown'))
+                    elif depth == 2 and tag == 'storeItem' and path[1] == 'storeItems':
+                        store_items_count += 1
+                    
+                    # Free elements as they close, the root stays but empties
+                    elem.clear()
                 
                 # Extract all relevant information
                 result = {
-                    'filename': Path(zip_path).name,
-                    'filesize': Path(zip_path).stat().st_size,
+                    'filename': filename,
+                    'filesize': filesize,
                     'modDesc_location': mod_desc_name,
                 }
                 
                 # Title (try English first, then any language)
-                title = root.find('.//title/en')
-                if title is None:
-                    title = root.find('.//title')
-                result['title'] = title.text if title is not None else 'Unknown'
+                if 'title_en' in found:
+                    result['title'] = found['title_en']
+                else:
+                    result['title'] = found.get('title', 'Unknown')
                 
                 # Version (from <version> element)
-                version_elem = root.find('version')
-                result['version'] = version_elem.text if version_elem is not None else 'Unknown'
+                result['version'] = found.get('version', 'Unknown')
                 
                 # Author
-                author = root.find('.//author')
-                result['author'] = author.text if author is not None else 'Unknown'
+                result['author'] = found.get('author', 'Unknown')
                 
                 # Description (try English first)
-                desc = root.find('.//description/en')
-                if desc is None:
-                    desc = root.find('.//description')
-                if desc is not None:
+                desc_key = 'description_en' if 'description_en' in found else 'description'
+                if desc_key in found:
                     # Remove CDATA wrapper if present
-                    desc_text = desc.text if desc.text else ''
+                    desc_text = found[desc_key] or ''
                     result['description'] = desc_text.strip()[:200]  # First 200 chars
                 else:
                     result['description'] = None
                 
                 # Additional metadata (for debugging)
                 result['debug_info'] = {
-                    'descVersion': root.get('descVersion', 'Not set'),
-                    'iconFilename': root.find('iconFilename').text if root.find('iconFilename') is not None else None,
-                    'multiplayer_supported': root.find('.//multiplayer').get('supported', 'unknown') if root.find('.//multiplayer') is not None else None,
+                    'descVersion': desc_version,
+                    'iconFilename': found.get('iconFilename'),
+                    'multiplayer_supported': found.get('multiplayer'),
+                    'store_items_count': store_items_count,
                 }
                 
-                # Count store items if present
-                store_items = root.findall('.//storeItem')
-                result['debug_info']['store_items_count'] = len(store_items)
-                
                 return result
     
     except zipfile.BadZipFile:
-        return {'error': 'Invalid zip file', 'filename': Path(zip_path).name}
+        return {'error': 'Invalid zip file', 'filename': filename}
     except ET.ParseError as e:
-        return {'error': f'XML parsing error: {e}', 'filename': Path(zip_path).name}
+        return {'error': f'XML parsing error: {e}', 'filename': filename}
     except Exception as e:
-        return {'error': f'Unexpected error: {e}', 'filename': Path(zip_path).name}
+        return {'error': f'Unexpected error: {e}', 'filename': filename}
+
+SIZE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB')
 
 def format_size(size_bytes):
     """Convert bytes to human readable format"""
-    for unit in ['B', 'KB', 'MB', 'GB']:
-        if size_bytes < 1024.0:
-            return f"{size_bytes:.2f} {unit}"
-        size_bytes /= 1024.0
-    return f"{size_bytes:.2f} TB"
+    # Each unit is 2**10 times the previous one, so the bit length picks it
+    unit_index = min((max(size_bytes, 1).bit_length() - 1) // 10, len(SIZE_UNITS) - 1)
+    return f"{size_bytes / (1 << (unit_index * 10)):.2f} {SIZE_UNITS[unit_index]}"
 
-def print_result(result):
-    """Print the result in a formatted way"""
+def format_json(result):
+    """Pretty-print the result as JSON (orjson when installed, it is much faster)"""
+    try:
+        import orjson
+        return orjson.dumps(result, option=orjson.OPT_INDENT_2).decode('utf-8')
+    except ImportError:
+        return json.dumps(result, indent=2, ensure_ascii=False)
+
+def print_result(result, show_json=False):
+    """Print the result in a formatted way (JSON dump only if show_json)"""
     print("\n" + "=" * 60)
     print("MOD PARSER TEST RESULT")
     print("=" * 60)
@@ -138,30 +174,34 @@ def print_result(result):
     print(f"🔍 Multiplayer: {debug.get('multiplayer_supported', 'N/A')}")
     print(f"🔍 Store Items: {debug.get('store_items_count', 0)}")
     
-    print("\n" + "=" * 60)
-    print("JSON OUTPUT")
-    print("=" * 60)
-    print(json.dumps(result, indent=2, ensure_ascii=False))
+    if show_json:
+        print("\n" + "=" * 60)
+        print("JSON OUTPUT")
+        print("=" * 60)
+        print(format_json(result))
     print("\n")
 
 def main():
     """Main test function"""
-    if len(sys.argv) < 2:
-        print("Usage: python test_mod_parser.py <path_to_mod.zip>")
+    args = sys.argv[1:]
+    show_json = '--json' in args
+    mod_paths = [arg for arg in args if arg != '--json']
+    
+    if not mod_paths:
+        print("Usage: python test_mod_parser.py [--json] <path_to_mod.zip>")
         print("\nExample:")
         print("  python test_mod_parser.py /path/to/FS25_ModName.zip")
         print("  python test_mod_parser.py ./mods/*.zip")
+        print("  python test_mod_parser.py --json /path/to/FS25_ModName.zip  (include JSON output)")
         sys.exit(1)
     
-    mod_paths = sys.argv[1:]
-    
     for mod_path in mod_paths:
         if not Path(mod_path).exists():
             print(f"❌ File not found: {mod_path}")
             continue
         
         result = parse_mod(mod_path)
-        print_result(result)
+        print_result(result, show_json)
         
         # Validation checks
         if 'error' not in result: